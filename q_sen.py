@@ -8,12 +8,30 @@ Quake Sentinel (SEA-only)
 """
 
 import os
-import time
+import asyncio
+import importlib.util
 import math
-import json
-import requests
+import httpx
+import numpy as np
+from collections import deque
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 
+# Optional speedups (see requirements.txt); each falls back to a plain equivalent
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; compute_impacts then uses a vectorized NumPy version
+    HAVE_NUMBA = False
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser accepts the same str/bytes
+    from json import loads as json_loads
+
+# h2 is optional and only used inside httpx; without it httpx speaks HTTP/1.1
+HTTP2 = importlib.util.find_spec("h2") is not None
+
 # === CONFIG (set sensitive values via environment variables) ===
 # Export BOT_TOKEN and RECIPIENTS before running:
 #   export BOT_TOKEN="123:ABC..."
@@ -31,7 +49,11 @@ if not RECIPIENTS:
 USGS_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_hour.geojson"
 MIN_MAGNITUDE = float(os.getenv("MIN_MAGNITUDE", "1.0"))
 CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", "300"))  # seconds
-SEEN_FILE = os.getenv("SEEN_FILE", "seen_ids.json")
+ADAPTIVE = os.getenv("ADAPTIVE", "0") == "1"  # opt-in: back off polling while the feed is quiet (delays alerts)
+MAX_CHECK_INTERVAL = int(os.getenv("MAX_CHECK_INTERVAL", "900"))  # seconds, back-off ceiling
+SEEN_FILE = os.getenv("SEEN_FILE", "seen_ids.txt")  # one quake ID per line
+LEGACY_SEEN_FILE = "seen_ids.json"  # pre-upgrade default; read once if SEEN_FILE doesn't exist yet
+SEEN_MAX = int(os.getenv("SEEN_MAX", "4096"))  # IDs remembered; the hourly feed can't repeat older ones
 LOG_FILE = os.getenv("LOG_FILE", "quake_log.txt")
 PRIORITY_CITY = "Tacloban"
 
@@ -47,78 +69,239 @@ CITIES = {
     "Samar": (12.0, 125.0),
 }
 
+# Struct-of-arrays view of CITIES (radians) for vectorized distance math
+_CITY_NAMES = list(CITIES)
+_CITY_LAT = np.radians(np.array([v[0] for v in CITIES.values()], dtype=np.float64))
+_CITY_LON = np.radians(np.array([v[1] for v in CITIES.values()], dtype=np.float64))
+
 # SEA bounding box
-def is_in_sea_region(lat, lon):
-    return (4.5 <= lat <= 21.5) and (116.0 <= lon <= 127.5)
+SEA_LAT_MIN, SEA_LAT_MAX = 4.5, 21.5
+SEA_LON_MIN, SEA_LON_MAX = 116.0, 127.5
 
 
 # === Utilities ===
-def distance_km(lat1, lon1, lat2, lon2):
-    R = 6371.0
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = (math.sin(dphi / 2) ** 2) + math.cos(phi1) * math.cos(phi2) * (math.sin(dlambda / 2) ** 2)
-    return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
-def estimate_intensity(mag, dist_km):
-    if dist_km < 30:
-        level = mag + 1.5
-    elif dist_km < 100:
-        level = mag
-    elif dist_km < 300:
-        level = mag - 1.5
-    else:
-        level = mag - 2.5
-
-    if level >= 7:
-        return "VII (Severe)"
-    elif level >= 6:
-        return "VI (Very Strong)"
-    elif level >= 5:
-        return "V (Strong)"
-    elif level >= 4:
-        return "IV (Moderate)"
-    elif level >= 3:
-        return "III (Weak)"
-    elif level >= 2:
-        return "II (Slight)"
-    else:
-        return "I (Barely Felt)"
+# Intensity lookup tables: distance band -> magnitude offset, then the
+# adjusted level -> index into _LEVEL_NAMES (both via searchsorted, side="right"
+# so each threshold is inclusive on its upper band, matching the old ladder).
+_DIST_BANDS = np.array([30.0, 100.0, 300.0])
+_MAG_OFFSETS = np.array([1.5, 0.0, -1.5, -2.5])
+_LEVEL_THRESH = np.array([2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+_LEVEL_NAMES = (
+    "I (Barely Felt)",
+    "II (Slight)",
+    "III (Weak)",
+    "IV (Moderate)",
+    "V (Strong)",
+    "VI (Very Strong)",
+    "VII (Severe)",
+)
+
+
+# Distances (km) and intensity codes (indices into _LEVEL_NAMES) for every
+# city in one pass. city_lats / city_lons are in radians (see _CITY_LAT / _CITY_LON).
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def compute_impacts(lat, lon, mag, city_lats, city_lons):
+        R = 6371.0
+        n = city_lats.shape[0]
+        dists = np.empty(n, dtype=np.float64)
+        phi1 = math.radians(lat)
+        lambda1 = math.radians(lon)
+        for i in range(n):
+            dphi = city_lats[i] - phi1
+            dlambda = city_lons[i] - lambda1
+            a = (math.sin(dphi / 2) ** 2) + math.cos(phi1) * math.cos(city_lats[i]) * (math.sin(dlambda / 2) ** 2)
+            dists[i] = 2 * R * math.asin(math.sqrt(min(a, 1.0)))  # clamp rounding overshoot
+
+        band = np.searchsorted(_DIST_BANDS, dists, side="right")
+        levels = np.searchsorted(_LEVEL_THRESH, mag + _MAG_OFFSETS[band], side="right").astype(np.int8)
+        return dists, levels
+else:
+    # Halved unit vectors of the cities: the haversine term for every city is then
+    # sin^2(angle / 2) = (1 - cos(angle)) / 2 = 0.5 - dot(half_unit, point), one dot product.
+    def _half_unit_vectors(lats, lons):
+        cos_lat = np.cos(lats)
+        return 0.5 * np.column_stack((cos_lat * np.cos(lons), cos_lat * np.sin(lons), np.sin(lats)))
+
+    _CITY_HALF_XYZ = _half_unit_vectors(_CITY_LAT, _CITY_LON)
+
+    # Vectorized over the cities with no Python loop; on 8-element arrays the
+    # per-call NumPy overhead dominates, so the number of array ops is kept minimal.
+    def compute_impacts(lat, lon, mag, city_lats, city_lons):
+        R = 6371.0
+        half_xyz = _CITY_HALF_XYZ if city_lats is _CITY_LAT else _half_unit_vectors(city_lats, city_lons)
+        phi1, lambda1 = math.radians(lat), math.radians(lon)
+        cos_phi1 = math.cos(phi1)
+        a = 0.5 - half_xyz.dot((cos_phi1 * math.cos(lambda1), cos_phi1 * math.sin(lambda1), math.sin(phi1)))
+        np.abs(a, out=a)  # clamp rounding overshoot: tiny negatives at ~0 km ...
+        np.minimum(a, 1.0, out=a)  # ... and above 1 near the antipode
+        dists = np.arcsin(np.sqrt(a, out=a), out=a)
+        dists *= 2 * R
+
+        # Intensity code for each distance band at this magnitude, then pick per city
+        band_levels = _LEVEL_THRESH.searchsorted(mag + _MAG_OFFSETS, "right").astype(np.int8)
+        return dists, band_levels[_DIST_BANDS.searchsorted(dists, "right")]
+
+
+# Compile once at startup so the first real alert doesn't pay the JIT cost (no-op cost without numba)
+compute_impacts(0.0, 0.0, 0.0, _CITY_LAT, _CITY_LON)
 
 
 # === Persistence for seen IDs ===
-def load_seen():
+# Append-only log: one ID per line, so each new quake costs one short write.
+_seen_fh = None
+
+
+# Most recent seen IDs: set for O(1) membership, deque for eviction order
+class BoundedSeen:
+    def __init__(self, maxlen):
+        self.d = deque(maxlen=maxlen)
+        self.s = set()
+
+    def __contains__(self, quake_id):
+        return quake_id in self.s
+
+    def __iter__(self):
+        return iter(self.d)  # oldest first
+
+    def __len__(self):
+        return len(self.d)
+
+    def add(self, quake_id):
+        if quake_id in self.s:
+            return
+        if len(self.d) == self.d.maxlen:
+            self.s.discard(self.d.popleft())
+        self.d.append(quake_id)
+        self.s.add(quake_id)
+
+    def load(self, path):
+        if not os.path.exists(path) and os.path.exists(LEGACY_SEEN_FILE):
+            path = LEGACY_SEEN_FILE
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except Exception:
+            return
+
+        # Older versions stored a JSON list (rewritten in line format by the next compact_seen)
+        if text.lstrip().startswith("["):
+            try:
+                ids = json_loads(text)
+            except Exception:
+                return
+        else:
+            ids = (line.strip() for line in text.splitlines())
+
+        for quake_id in ids:
+            if quake_id:
+                self.add(quake_id)
+
+
+def append_seen(quake_id):
+    global _seen_fh
     try:
-        with open(SEEN_FILE, "r") as f:
-            return set(json.load(f))
-    except Exception:
-        return set()
+        if _seen_fh is None:
+            _seen_fh = open(SEEN_FILE, "a", buffering=1)  # line-buffered
+        _seen_fh.write(quake_id + "\n")
+    except Exception as e:
+        print("Warning: could not save seen ID:", e)
 
 
-def save_seen(seen_set):
+# Rewrite the log from the in-memory IDs (deduplicated, at most SEEN_MAX) to cap its growth
+def compact_seen(seen_set):
+    global _seen_fh
     try:
-        with open(SEEN_FILE, "w") as f:
-            json.dump(list(seen_set), f)
+        tmp_file = SEEN_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.writelines(f"{quake_id}\n" for quake_id in seen_set)
+        if _seen_fh is not None:
+            _seen_fh.close()
+            _seen_fh = None
+        os.replace(tmp_file, SEEN_FILE)
     except Exception as e:
-        print("Warning: could not save seen IDs:", e)
+        print("Warning: could not compact seen IDs:", e)
 
 
 # === Telegram send ===
-def send_to_recipients(text, lat=None, lon=None):
+# One shared async client: keep-alive connections, and (when h2 is installed)
+# HTTP/2 multiplexes concurrent Telegram calls over a single connection
+# follow_redirects matches requests' behaviour (httpx doesn't follow them by default)
+_client = httpx.AsyncClient(timeout=15, http2=HTTP2, follow_redirects=True, limits=httpx.Limits(max_connections=16))
+
+TELEGRAM_CAPTION_LIMIT = 1024  # max caption length for sendPhoto
+TELEGRAM_MESSAGE_LIMIT = 4096  # max text length for sendMessage
+
+
+# Telegram reports errors as {"ok": false, ...} with a 4xx status, which httpx doesn't raise on
+def _telegram_ok(r, method, chat_id):
+    try:
+        ok = r.is_success and json_loads(r.content).get("ok", False)
+    except Exception:
+        ok = False
+    if not ok:
+        print(f"Telegram {method} failed for {chat_id}: {r.status_code} {r.text[:200]}")
+    return ok
+
+
+# Returns True once the text has reached chat_id
+async def _send_one(chat_id, text, lat=None, lon=None):
     base = f"https://api.telegram.org/bot{BOT_TOKEN}"
-    for chat_id in RECIPIENTS:
-        try:
-            # Send map photo first if coordinates provided
-            if lat is not None and lon is not None:
-                map_url = f"https://maps.googleapis.com/maps/api/staticmap?center={lat},{lon}&zoom=6&size=600x400&markers=color:red|{lat},{lon}"
-                # If you have a Google API key, append &key=YOUR_KEY to the map_url
-                requests.post(f"{base}/sendPhoto", data={"chat_id": chat_id, "photo": map_url}, timeout=10)
-            # Then send message (Markdown)
-            requests.post(f"{base}/sendMessage", data={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}, timeout=10)
-        except Exception as e:
-            print(f"Failed to send to {chat_id}:", e)
+    try:
+        if lat is not None and lon is not None:
+            map_url = f"https://maps.googleapis.com/maps/api/staticmap?center={lat},{lon}&zoom=6&size=600x400&markers=color:red|{lat},{lon}"
+            # If you have a Google API key, append &key=YOUR_KEY to the map_url
+            if len(text) <= TELEGRAM_CAPTION_LIMIT:
+                # Map + message in a single request
+                r = await _client.post(f"{base}/sendPhoto", data={"chat_id": chat_id, "photo": map_url, "caption": text, "parse_mode": "Markdown"}, timeout=10)
+                if _telegram_ok(r, "sendPhoto", chat_id):
+                    return True
+                # Photo rejected (e.g. Telegram couldn't fetch the map): the text must still go out
+            else:
+                # Too long for a caption: send map photo first, then the message
+                r = await _client.post(f"{base}/sendPhoto", data={"chat_id": chat_id, "photo": map_url}, timeout=10)
+                _telegram_ok(r, "sendPhoto", chat_id)
+        # Send message (Markdown)
+        r = await _client.post(f"{base}/sendMessage", data={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}, timeout=10)
+        return _telegram_ok(r, "sendMessage", chat_id)
+    except Exception as e:
+        print(f"Failed to send to {chat_id}:", e)
+        return False
+
+
+# Returns one delivery flag per recipient (in RECIPIENTS order)
+async def send_to_recipients(text, lat=None, lon=None):
+    # All recipients concurrently; the client's connection limit bounds the burst
+    return await asyncio.gather(*(_send_one(chat_id, text, lat, lon) for chat_id in RECIPIENTS))
+
+
+# === USGS feed fetch ===
+# Validators from the last 200 response, sent back so unchanged polls get a bodyless 304
+_last_etag = None
+_last_modified = None
+
+
+# Returns (data, validators). On a 304 both are None. validators is the
+# (ETag, Last-Modified) pair to pass to remember_validators() once the poll has been
+# fully handled, so a poll that fails is re-fetched in full next time.
+async def fetch_feed():
+    headers = {"Accept-Encoding": "gzip"}
+    if _last_etag:
+        headers["If-None-Match"] = _last_etag
+    if _last_modified:
+        headers["If-Modified-Since"] = _last_modified
+
+    r = await _client.get(USGS_URL, headers=headers)
+    if r.status_code == 304:
+        return None, None  # feed unchanged since last poll
+    r.raise_for_status()
+    return json_loads(r.content), (r.headers.get("ETag"), r.headers.get("Last-Modified"))
+
+
+def remember_validators(etag, last_modified):
+    global _last_etag, _last_modified
+    _last_etag = etag
+    _last_modified = last_modified
 
 
 # === Logging helper ===
@@ -129,7 +312,73 @@ def log_event(line):
 
 
 # === Alert formatting and impact analysis ===
-def build_alert_message(quake):
+# Static message parts, built once; indexed by bool in the impact lines
+_MARKER = ("🏙️", "⚠️")  # [is epicenter city]
+_STAR = ("", "⭐")  # [is priority city]
+_ALERT_HEADER = "🌏 *EARTHQUAKE ALERT*\n"
+_INTENSITIES_HEADER = "🌐 *Estimated Intensities*"
+_DIGEST_SEPARATOR = "\n---\n\n"
+_DIGEST_MAP_MARK = "🔴 *Strongest — shown on map*"
+_REMINDER_TAIL = (
+    "⚠️ *QUICK REMINDER:*\n"
+    "• Stay calm, move to safety\n"
+    "• Avoid glass/walls/heavy items\n"
+    "• Turn off gas/electricity if needed\n"
+    "• Expect aftershocks — monitor updates\n"
+)
+
+
+# Impact analysis shared by alerts and the daily report: only relevant cities
+# (within 400 km) plus always the priority city, nearest first.
+# CITIES is fixed at startup, so _format_impact is generated once with the
+# per-city selection unrolled and each city's "*Name*⭐: ~" prefix baked in.
+def _build_format_impact():
+    prefixes = tuple(f" *{city}*{_STAR[city == PRIORITY_CITY]}: ~" for city in _CITY_NAMES)
+    src = [
+        "def _format_impact(lat, lon, mag):",
+        "    dists, levels = compute_impacts(float(lat), float(lon), float(mag), _CITY_LAT, _CITY_LON)",
+        # tolist() converts once instead of boxing a NumPy scalar per city
+        f"    {', '.join(f'd{i}' for i in range(len(_CITY_NAMES)))} = dists.tolist()  # {', '.join(_CITY_NAMES)}",
+        "    levels = levels.tolist()",
+        "    rows = []",
+    ]
+    for i, city in enumerate(_CITY_NAMES):
+        if city == PRIORITY_CITY:
+            src.append(f"    rows.append((d{i}, {i}))")
+        else:
+            src.append(f"    if d{i} <= 400:")
+            src.append(f"        rows.append((d{i}, {i}))")
+    src += [
+        "    rows.sort()  # (dist, index): ties keep CITIES order",
+        "    epicenter_dist, epi = rows[0]",
+        "    impact_text = '\\n'.join([",
+        "        _MARKER[i == epi] + _PREFIXES[i] + str(int(d)) + ' km → ' + _LEVEL_NAMES[levels[i]]",
+        "        for d, i in rows",
+        "    ])",
+        "    return _CITY_NAMES[epi], epicenter_dist, _LEVEL_NAMES[levels[epi]], impact_text",
+    ]
+
+    namespace = {
+        "compute_impacts": compute_impacts,
+        "_CITY_LAT": _CITY_LAT,
+        "_CITY_LON": _CITY_LON,
+        "_CITY_NAMES": tuple(_CITY_NAMES),
+        "_LEVEL_NAMES": _LEVEL_NAMES,
+        "_MARKER": _MARKER,
+        "_PREFIXES": prefixes,
+    }
+    exec(compile("\n".join(src), "<impact>", "exec"), namespace)
+    return namespace["_format_impact"]
+
+
+# Memoized on the exact feed values, so a quake re-seen across polls with
+# unchanged coordinates/magnitude is a cache hit without altering the result.
+_format_impact = lru_cache(maxsize=512)(_build_format_impact())
+
+
+# Per-quake body lines (location .. map link) shared by single alerts and digests.
+# Parts are joined with "\n"; a trailing "\n" on a part leaves a blank line.
+def _quake_parts(quake):
     props = quake.get("properties", {})
     geom = quake.get("geometry", {})
     coords = geom.get("coordinates", [0, 0])
@@ -143,57 +392,64 @@ def build_alert_message(quake):
     time_str_utc = utc_time.strftime("%Y-%m-%d %H:%M:%S UTC")
     time_str_ph = ph_time.strftime("%Y-%m-%d %I:%M %p (PHT)")
 
-    # Impact analysis (only include relevant cities + always Tacloban)
-    impact_data = []
-    for city, (clat, clon) in CITIES.items():
-        dist = distance_km(lat, lon, clat, clon)
-        intensity = estimate_intensity(mag, dist)
-        if city == PRIORITY_CITY or dist <= 400:
-            impact_data.append((city, dist, intensity))
-
-    # If none included (rare) still include Tacloban
-    if not impact_data:
-        clat, clon = CITIES[PRIORITY_CITY]
-        d = distance_km(lat, lon, clat, clon)
-        impact_data.append((PRIORITY_CITY, d, estimate_intensity(mag, d)))
-
-    impact_data.sort(key=lambda x: x[1])
-    epicenter_city, epicenter_dist, epicenter_int = impact_data[0]
-
-    impact_lines = []
-    for city, dist, intensity in impact_data:
-        marker = "⚠️" if city == epicenter_city else "🏙️"
-        priority_mark = "⭐" if city == PRIORITY_CITY else ""
-        impact_lines.append(f"{marker} *{city}*{priority_mark}: ~{int(dist)} km → {intensity}")
-
-    impact_text = "\n".join(impact_lines)
-
-    msg = (
-        f"🌏 *EARTHQUAKE ALERT*\n\n"
-        f"📍 *Location:* {place}\n"
-        f"💥 *Magnitude:* {mag}\n"
-        f"🕒 *Time:* {time_str_utc} / {time_str_ph}\n"
-        f"📌 *Epicenter Zone:* {epicenter_city} ({int(epicenter_dist)} km, {epicenter_int})\n\n"
-        f"🌐 *Estimated Intensities*\n{impact_text}\n\n"
-        f"🗺 https://www.google.com/maps?q={lat},{lon}\n\n"
-        "⚠️ *QUICK REMINDER:*\n"
-        "• Stay calm, move to safety\n"
-        "• Avoid glass/walls/heavy items\n"
-        "• Turn off gas/electricity if needed\n"
-        "• Expect aftershocks — monitor updates\n"
-    )
+    epicenter_city, epicenter_dist, epicenter_int, impact_text = _format_impact(lat, lon, mag)
+
+    parts = [
+        f"📍 *Location:* {place}",
+        f"💥 *Magnitude:* {mag}",
+        f"🕒 *Time:* {time_str_utc} / {time_str_ph}",
+        f"📌 *Epicenter Zone:* {epicenter_city} ({int(epicenter_dist)} km, {epicenter_int})\n",
+        _INTENSITIES_HEADER,
+        f"{impact_text}\n",
+        f"🗺 https://www.google.com/maps?q={lat},{lon}\n",
+    ]
+    return parts, lat, lon
+
 
+def build_alert_message(quake):
+    parts, lat, lon = _quake_parts(quake)
+    msg = "\n".join([_ALERT_HEADER, *parts, _REMINDER_TAIL])
     return msg, lat, lon
 
 
-# === Daily report function (can also be called manually) ===
-def send_daily_report():
+# Several new quakes from one poll (e.g. aftershocks) in a single message;
+# the map goes to the strongest one, whose block is marked and listed first so it
+# is never cut. Blocks that would push the text past Telegram's message limit are
+# summarized as a count instead.
+def build_digest_message(quakes):
+    strongest = max(quakes, key=lambda q: q.get("properties", {}).get("mag") or 0)
+    coords = strongest.get("geometry", {}).get("coordinates", [0, 0])
+    lon, lat = coords[0], coords[1]
+
+    header = f"🌏 *EARTHQUAKE ALERTS* ({len(quakes)} new)\n"
+    budget = TELEGRAM_MESSAGE_LIMIT - len(header) - len(_REMINDER_TAIL) - 64  # room for the overflow note
+    blocks = []
+    for quake in [strongest, *(q for q in quakes if q is not strongest)]:
+        parts = _quake_parts(quake)[0]
+        if quake is strongest:
+            parts = [_DIGEST_MAP_MARK, *parts]
+        block = "\n".join(parts)
+        budget -= len(block) + len(_DIGEST_SEPARATOR)
+        if budget < 0:
+            break
+        blocks.append(block)
+
+    body = _DIGEST_SEPARATOR.join(blocks)
+    if len(blocks) < len(quakes):
+        body += f"\n…and {len(quakes) - len(blocks)} more\n"
+    msg = "\n".join([header, body, _REMINDER_TAIL])
+    return msg, lat, lon
+
+
+# === Daily report function (can also be run manually) ===
+# Coroutine: run it manually with asyncio.run(send_daily_report())
+async def send_daily_report():
     try:
-        r = requests.get(USGS_URL, timeout=10)
-        data = r.json()
+        r = await _client.get(USGS_URL, timeout=10)
+        data = json_loads(r.content)
         features = data.get("features", [])
         if not features:
-            send_to_recipients("📅 *Daily Report:* No earthquakes recorded in the past 24 hours.")
+            await send_to_recipients("📅 *Daily Report:* No earthquakes recorded in the past 24 hours.")
             return
 
         latest = features[0]
@@ -209,26 +465,7 @@ def send_daily_report():
 
         lat, lon = coords[1], coords[0]
 
-        # Build impact lines using the same logic
-        impact_data = []
-        for city, (clat, clon) in CITIES.items():
-            dist = distance_km(lat, lon, clat, clon)
-            intensity = estimate_intensity(mag, dist)
-            if city == PRIORITY_CITY or dist <= 400:
-                impact_data.append((city, dist, intensity))
-        if not impact_data:
-            clat, clon = CITIES[PRIORITY_CITY]
-            d = distance_km(lat, lon, clat, clon)
-            impact_data.append((PRIORITY_CITY, d, estimate_intensity(mag, d)))
-        impact_data.sort(key=lambda x: x[1])
-
-        epicenter_city, epicenter_dist, epicenter_int = impact_data[0]
-        impact_lines = []
-        for city, dist, intensity in impact_data:
-            marker = "⚠️" if city == epicenter_city else "🏙️"
-            priority_mark = "⭐" if city == PRIORITY_CITY else ""
-            impact_lines.append(f"{marker} *{city}*{priority_mark}: ~{int(dist)} km → {intensity}")
-        impact_text = "\n".join(impact_lines)
+        epicenter_city, epicenter_dist, epicenter_int, impact_text = _format_impact(lat, lon, mag)
 
         report = (
             f"📊 *Daily Quake Report*\n\n"
@@ -239,68 +476,111 @@ def send_daily_report():
             f"🌐 *Estimated Intensities*\n{impact_text}\n\n"
             "✅ System Operational, Chief."
         )
-        send_to_recipients(report, lat, lon)
+        await send_to_recipients(report, lat, lon)
         log_event(f"Daily report sent for quake {place} mag {mag}")
     except Exception as e:
         print("Daily report error:", e)
 
 
+# === Daily report scheduler ===
+# Runs as its own task so polling back-off never delays the report.
+def _seconds_until_daily_report():
+    now_ph = datetime.now(timezone.utc) + timedelta(hours=8)
+    next_run = now_ph.replace(hour=8, minute=0, second=0, microsecond=0)
+    if next_run <= now_ph:
+        next_run += timedelta(days=1)
+    return (next_run - now_ph).total_seconds()
+
+
+async def daily_report_loop(seen):
+    while True:
+        await asyncio.sleep(_seconds_until_daily_report())
+        await send_daily_report()
+        compact_seen(seen)
+
+
+# Background tasks otherwise fail silently; surface the error in the log
+def _log_task_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        print("Daily report task error:", task.exception())
+        log_event(f"Daily report task error: {task.exception()}")
+
+
 # === Main monitoring loop ===
-def monitor_loop():
-    seen = load_seen()
-    last_daily_date = None
+async def monitor_loop():
+    seen = BoundedSeen(SEEN_MAX)
+    seen.load(SEEN_FILE)
+    compact_seen(seen)  # trim the log to what was kept (and convert a legacy JSON file)
+    interval = CHECK_INTERVAL
+    daily_task = asyncio.create_task(daily_report_loop(seen))  # keep a reference so it is not GC-ed
+    daily_task.add_done_callback(_log_task_failure)
     print("⚡ Quake Sentinel (SEA) online. Monitoring...")
 
     while True:
         try:
-            r = requests.get(USGS_URL, timeout=15)
-            data = r.json()
-            features = data.get("features", [])
-
-            # iterate newest first
-            for quake in features:
+            data, validators = await fetch_feed()
+            features = data.get("features", []) if data is not None else []
+
+            # Filter on magnitude and SEA bbox in one vectorized pass; only the
+            # (usually zero) matching features are touched in Python below.
+            n = len(features)
+            coords = [f.get("geometry", {}).get("coordinates", [0, 0]) for f in features]
+            lats = np.fromiter((c[1] for c in coords), dtype=np.float64, count=n)
+            lons = np.fromiter((c[0] for c in coords), dtype=np.float64, count=n)
+            raw_mags = (f.get("properties", {}).get("mag") for f in features)
+            mags = np.fromiter((np.nan if m is None else m for m in raw_mags), dtype=np.float64, count=n)
+            mask = (
+                (mags >= MIN_MAGNITUDE)
+                & (lats >= SEA_LAT_MIN) & (lats <= SEA_LAT_MAX)
+                & (lons >= SEA_LON_MIN) & (lons <= SEA_LON_MAX)
+            )
+
+            # collect new quakes of interest (newest first), then send one message per poll
+            new_quakes = []
+            for i in np.flatnonzero(mask):
+                quake = features[i]
                 quake_id = quake.get("id")
-                props = quake.get("properties", {})
-                geom = quake.get("geometry", {})
-                coords = geom.get("coordinates", [0, 0])
-                lon, lat = coords[0], coords[1]
-                mag = props.get("mag", 0)
-
-                # skip if below magnitude threshold or outside SEA
-                if mag is None or mag < MIN_MAGNITUDE:
-                    continue
-                if not is_in_sea_region(lat, lon):
-                    continue
-
                 if quake_id and quake_id not in seen:
-                    # new quake of interest
-                    msg, mlat, mlon = build_alert_message(quake)
-                    send_to_recipients(msg, mlat, mlon)
+                    new_quakes.append(quake)
+
+            if new_quakes:
+                if len(new_quakes) == 1:
+                    msg, mlat, mlon = build_alert_message(new_quakes[0])
+                else:
+                    msg, mlat, mlon = build_digest_message(new_quakes)
+                delivered = await send_to_recipients(msg, mlat, mlon)
+                if not any(delivered):
+                    # Leave the quakes unseen (and the feed validators unstored) so the next poll retries
+                    raise RuntimeError(f"alert for {len(new_quakes)} quake(s) reached no recipient; retrying next poll")
+
+                for quake in new_quakes:
+                    quake_id = quake["id"]
+                    props = quake.get("properties", {})
                     seen.add(quake_id)
-                    save_seen(seen)
-                    log_event(f"Alert sent: id={quake_id} mag={mag} loc={props.get('place')}")
-                    # small delay between notifications to recipients to avoid bursts
-                    time.sleep(1)
-
-            # Daily report at 08:00 PHT (UTC+8)
-            now_utc = datetime.now(timezone.utc)
-            now_ph = now_utc + timedelta(hours=8)
-            if now_ph.hour == 8 and (last_daily_date != now_ph.date()):
-                send_daily_report()
-                last_daily_date = now_ph.date()
+                    append_seen(quake_id)
+                    log_event(f"Alert sent: id={quake_id} mag={props.get('mag')} loc={props.get('place')}")
+
+            if validators is not None:
+                remember_validators(*validators)
+
+            # Adaptive polling: double the wait after each quiet poll (up to
+            # MAX_CHECK_INTERVAL), drop back to CHECK_INTERVAL once activity shows up
+            if ADAPTIVE:
+                interval = CHECK_INTERVAL if mask.any() else min(interval * 2, MAX_CHECK_INTERVAL)
 
         except Exception as e:
             print("Monitor loop error:", e)
             log_event(f"Monitor error: {e}")
 
-        time.sleep(CHECK_INTERVAL)
+        await asyncio.sleep(interval)
 
 
 # === Optional manual test function ===
-def send_test_alert():
+# Coroutine: run it with asyncio.run(send_test_alert())
+async def send_test_alert():
     # sends a simulated test message centered near Manila
     test_msg = "🧪 *Test Quake Alert* — This is a system check."
-    send_to_recipients(test_msg, 14.5995, 120.9842)
+    await send_to_recipients(test_msg, 14.5995, 120.9842)
     log_event("Manual test alert sent")
 
 
@@ -308,4 +588,4 @@ def send_test_alert():
 if __name__ == "__main__":
     # quick note: ensure BOT_TOKEN and RECIPIENTS set in environment before running
     # run monitor loop
-    monitor_loop()
\ No newline at end of file
+    asyncio.run(monitor_loop())
\ No newline at end of file